@@ -19,64 +19,164 @@ import time
 import argparse
 import os
 import heapq
+import functools
+import multiprocessing
 
 OUTPUT_DIR = "../output"
 
 def read_instance(file):
-    '''reads set cover instance from file'''
-    with open(file) as f:
-        n, m = map(int, f.readline().split())
-        subsets = []
-        for _ in range(m):
-            line = list(map(int, f.readline().split()))
-            subsets.append(set(line[1:]))
-    return n, subsets
-
-def greedy_candidate_sol(n, subsets, solution=None):
+    '''reads set cover instance from file, returns subsets both as sorted element tuples and as int bitmasks (bit e set for element e)'''
+    # parse the whole file in one pass, then walk the flat token list: <size> <elements...> per subset
+    with open(file, 'rb') as f:
+        tokens = list(map(int, f.read().split()))
+    n, m = tokens[0], tokens[1]
+    n_bytes = (n >> 3) + 1
+    subsets = []
+    masks = []
+    cursor = 2
+    for _ in range(m):
+        size = tokens[cursor]
+        # flat, deduplicated tuples: a fraction of a set's memory and faster to walk in the cover count updates
+        subset = tuple(sorted(set(tokens[cursor + 1:cursor + 1 + size])))
+        cursor += 1 + size
+        # set bits in a byte buffer and convert once, instead of growing a big int per element
+        bits = bytearray(n_bytes)
+        for e in subset:
+            bits[e >> 3] |= 1 << (e & 7)
+        subsets.append(subset)
+        masks.append(int.from_bytes(bits, 'little'))
+    return n, subsets, masks
+
+def build_covers(n, subsets):
+    '''inverted index: covers[e] lists the ids of the subsets containing element e'''
+    covers = [[] for _ in range(n + 1)]
+    for i, subset in enumerate(subsets):
+        for e in subset:
+            covers[e].append(i)
+    return covers
+
+def drop_dominated(n, subsets, masks):
+    '''removes duplicate subsets and subsets contained in another subset, they can be swapped for the larger one in any cover
+    returns the kept subsets, their masks and their ids in the original instance'''
+    covers = build_covers(n, subsets)
+    covers_mask = [sum(1 << i for i in ids) for ids in covers]
+    all_ids = (1 << len(subsets)) - 1
+    ids = []
+    for i, subset in enumerate(subsets):
+        # ids of the subsets containing subset i: intersect the cover lists, rarest element first so it shrinks fast
+        supersets = all_ids
+        for e in sorted(subset, key=lambda e: len(covers[e])):
+            supersets &= covers_mask[e]
+            if supersets == 1 << i:
+                break
+        supersets &= ~(1 << i)
+        # dominated by a strict superset, or a duplicate of an earlier subset
+        if not any(j < i or masks[j] != masks[i] for j in iter_bits(supersets)):
+            ids.append(i)
+    return [subsets[i] for i in ids], [masks[i] for i in ids], ids
+
+def packing_lower_bound(uncovered, covers_mask, elem_order):
+    '''lower bound on the number of subsets needed to cover uncovered: greedily collect uncovered elements
+    no two of which share a covering subset, each of them needs a subset of its own'''
+    lb = 0
+    used = 0
+    for e in elem_order:
+        if uncovered >> e & 1 and not covers_mask[e] & used:
+            lb += 1
+            used |= covers_mask[e]
+    return lb
+
+def iter_bits(mask):
+    '''yields the positions of the set bits of mask in increasing order'''
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def greedy_candidate_sol(n, masks, solution=None):
     '''greedy approximation algorithm: pick subset covering most uncovered elements until all covered, used for bnb, greedy and local search'''
-    uncovered = set(range(1, n + 1))
+    uncovered = (1 << (n + 1)) - 2  # bits 1..n
     if solution:
         for i in solution:
-            uncovered -= subsets[i]
+            uncovered &= ~masks[i]
     else:
         solution = set()
-    while uncovered:
-        best_idx, best_size = 0, 0
-        for idx, subset in enumerate(subsets):
-            intersection = uncovered.intersection(subset)
-            if len(intersection) > best_size:  # pick largest intersection
-                best_idx, best_size = idx, len(intersection)
-        solution.add(best_idx)
-        uncovered -= subsets[best_idx]
+    # Lazy greedy: gains only shrink as elements get covered, so a stale gain is an upper bound.
+    # Heap entries are (-gain, iteration the gain was computed at, subset index).
+    # Subsets that cover nothing never enter the heap, which keeps repairs of nearly complete covers small.
+    heap = []
+    for idx, mask in enumerate(masks):
+        size = (uncovered & mask).bit_count()
+        if size:
+            heap.append((-size, 0, idx))
+    heapq.heapify(heap)
+    pop, push = heapq.heappop, heapq.heappush  # local names for the hot loop
+    iter_ctr = 0
+    while uncovered and heap:
+        neg_gain, stamp, idx = pop(heap)
+        if stamp == iter_ctr:  # gain is up to date, so it is the largest intersection
+            solution.add(idx)
+            uncovered &= ~masks[idx]
+            iter_ctr += 1
+            continue
+        size = (uncovered & masks[idx]).bit_count()  # popcount of intersection
+        if size:
+            push(heap, (-size, iter_ctr, idx))
     return solution
 
 
-def find_bnb_sol(n, subsets, time_limit):
-    '''exact branch-and-bound algorithm: backtracking algorithm using a lower bound and upper bound for the set cover problem similar to lecture description'''
-    start = time.time()
-    trace = []
-    # Initial upper bound found by greedy_candidate_sol
-    best_solution = greedy_candidate_sol(n, subsets)
-    best_size = len(best_solution)
+def branch(node, best_size, search_data):
+    '''expands a BnB node: picks one uncovered element and returns the children for all remaining sets that include it'''
+    masks, covers_mask, elem_order, max_set_size = search_data
+    lb, k, chosen_sets, uncovered, rem_sets = node
+
+    # Cheap bound failed to prune, try the tighter packing bound once per expanded node
+    node_lb = k + packing_lower_bound(uncovered, covers_mask, elem_order)
+    if node_lb >= best_size:
+        return []
+
+    # Branch on the most constrained uncovered element: the one left with the fewest remaining sets
+    elem_sets, fewest = 0, None
+    for e in iter_bits(uncovered):
+        candidates = covers_mask[e] & rem_sets
+        count = candidates.bit_count()
+        if fewest is None or count < fewest:
+            elem_sets, fewest = candidates, count
+            if count <= 1:
+                break
+    if not elem_sets:  # some element can no longer be covered
+        return []
 
-    root_uncovered = frozenset(range(1, n + 1))
-    subset_ids = frozenset(range(len(subsets)))
-    max_set_size = max(len(subset) for subset in subsets)
-    root_lb = math.ceil(len(root_uncovered) / max_set_size)
+    children = []
+    for i in iter_bits(elem_sets):
+        new_chosen_sets = chosen_sets | (1 << i)
+        new_uncovered = uncovered & ~masks[i]
+        new_rem_sets = rem_sets & ~(1 << i)
 
-    # Priority queue: (lower_bound, current depth, current chosen sets, uncovered elements, remaining sets)
-    frontier = [(root_lb, 0, frozenset(), root_uncovered, subset_ids)]
+        # a chosen subset covers at most one element of the packing, so children inherit node_lb
+        new_lb = max((k + 1) + math.ceil(new_uncovered.bit_count() / max_set_size), node_lb)
+        if new_lb < best_size:
+            children.append((new_lb, k + 1, new_chosen_sets, new_uncovered, new_rem_sets))
+    return children
+
+
+def bnb_search(frontier, best_size, search_data, start, time_limit, shared_best=None, lock=None):
+    '''best-first search from the given frontier nodes, returns the improved solutions found as (elapsed, size, chosen sets)
+    if shared_best is given, the incumbent size is shared with the other workers through it'''
     heapq.heapify(frontier)
     visited = set()
+    improvements = []
 
     # frontier size maximum for memory management
     MAX_FRONTIER = 100_000
 
-    trace.append((0.0, best_size))
-    while frontier and time.time() - start < time_limit:
-        elapsed = time.time() - start
+    while frontier and time.perf_counter() - start < time_limit:
+        elapsed = time.perf_counter() - start
+        if shared_best is not None:
+            best_size = min(best_size, shared_best.value)
 
-        lb, k, chosen_sets, uncovered, rem_sets = heapq.heappop(frontier)
+        node = heapq.heappop(frontier)
+        lb, k, chosen_sets, uncovered, rem_sets = node
 
         # Prune if lower bound is worse than best found solution
         if lb >= best_size:
@@ -85,9 +185,12 @@ def find_bnb_sol(n, subsets, time_limit):
         # Success condition: all elements are covered
         if not uncovered:
             print(f"New best solution with {k} sets found")
-            best_solution = set(chosen_sets)
             best_size = k
-            trace.append((elapsed, best_size))
+            improvements.append((elapsed, k, chosen_sets))
+            if shared_best is not None:
+                with lock:
+                    if k < shared_best.value:
+                        shared_best.value = k
             continue
 
         state_key = (uncovered, chosen_sets)
@@ -95,18 +198,87 @@ def find_bnb_sol(n, subsets, time_limit):
             continue
         visited.add(state_key)
 
-        # Pick one uncovered element and try all sets that include it
-        elem = next(iter(uncovered))
-        for i in rem_sets:
-            if elem in subsets[i]:
-                new_chosen_sets = chosen_sets | {i}
-                new_uncovered = uncovered - subsets[i]
-                new_rem_sets = rem_sets - {i}
+        for child in branch(node, best_size, search_data):
+            if len(frontier) < MAX_FRONTIER:
+                heapq.heappush(frontier, child)
+
+    return improvements
+
+
+# per-process state of the parallel BnB workers, set by init_bnb_worker
+BNB_WORKER = {}
 
-                new_lb = (k + 1) + math.ceil(len(new_uncovered) / max_set_size)
-                if new_lb < best_size:
-                    if len(frontier) < MAX_FRONTIER:
-                        heapq.heappush(frontier, (new_lb, k + 1, new_chosen_sets, new_uncovered, new_rem_sets))
+def init_bnb_worker(shared_best, lock, search_data):
+    BNB_WORKER.update(shared_best=shared_best, lock=lock, search_data=search_data)
+
+def bnb_worker(args):
+    frontier, best_size, start, time_limit = args
+    return bnb_search(frontier, best_size, BNB_WORKER['search_data'], start, time_limit,
+                      BNB_WORKER['shared_best'], BNB_WORKER['lock'])
+
+
+def parallel_bnb(root, best_size, search_data, start, time_limit, workers):
+    '''master-worker BnB: expands the top of the tree until there are a few subtrees per worker,
+    then searches them in parallel while sharing the incumbent size for pruning'''
+    improvements = []
+    frontier = [root]
+    while frontier and len(frontier) < 4 * workers and time.perf_counter() - start < time_limit:
+        node = heapq.heappop(frontier)
+        if node[0] >= best_size:
+            continue
+        if not node[3]:
+            best_size = node[1]
+            improvements.append((time.perf_counter() - start, node[1], node[2]))
+            continue
+        for child in branch(node, best_size, search_data):
+            heapq.heappush(frontier, child)
+    if not frontier:
+        return improvements
+
+    # deal the subtrees round-robin so every worker gets a mix of promising and weak nodes
+    frontier.sort()
+    tasks = [(frontier[w::workers], best_size, start, time_limit) for w in range(workers)]
+    shared_best = multiprocessing.Value('i', best_size, lock=False)
+    lock = multiprocessing.Lock()
+    with multiprocessing.Pool(workers, initializer=init_bnb_worker, initargs=(shared_best, lock, search_data)) as pool:
+        for worker_improvements in pool.imap_unordered(bnb_worker, tasks):
+            improvements.extend(worker_improvements)
+    return improvements
+
+
+def find_bnb_sol(n, subsets, masks, time_limit, workers=1):
+    '''exact branch-and-bound algorithm: backtracking algorithm using a lower bound and upper bound for the set cover problem similar to lecture description'''
+    start = time.perf_counter()
+    trace = []
+    # Initial upper bound found by greedy_candidate_sol
+    best_solution = greedy_candidate_sol(n, masks)
+    best_size = len(best_solution)
+
+    covers = build_covers(n, subsets)
+    covers_mask = [sum(1 << i for i in ids) for ids in covers]
+    # most constrained elements first, they block the fewest others in packing_lower_bound
+    elem_order = sorted(range(1, n + 1), key=lambda e: len(covers[e]))
+    root_uncovered = (1 << (n + 1)) - 2
+    subset_ids = (1 << len(masks)) - 1
+    max_set_size = max(mask.bit_count() for mask in masks)
+    root_lb = math.ceil(root_uncovered.bit_count() / max_set_size)
+    search_data = (masks, covers_mask, elem_order, max_set_size)
+
+    # Node: (lower_bound, current depth, current chosen sets, uncovered elements, remaining sets)
+    # sets of elements and of subset ids are int bitmasks, so state updates and hashing are single int ops
+    root = (root_lb, 0, 0, root_uncovered, subset_ids)
+
+    trace.append((0.0, best_size))
+    if workers > 1:
+        improvements = parallel_bnb(root, best_size, search_data, start, time_limit, workers)
+    else:
+        improvements = bnb_search([root], best_size, search_data, start, time_limit)
+
+    for elapsed, k, chosen_sets in sorted(improvements):
+        if k < best_size:
+            best_solution = set(iter_bits(chosen_sets))
+            best_size = k
+            trace.append((elapsed, best_size))
 
     return best_solution, trace
 
@@ -115,45 +287,105 @@ def cost(solution):
     return len(solution)
 
 
-def covers_all(n, subsets, solution):
-    '''checks if solution covers all elements'''
-    covered = set()
+def covers_all(n, masks, solution):
+    '''checks if solution covers all elements, stops as soon as everything is covered'''
+    full = (1 << (n + 1)) - 2
+    covered = 0
     for idx in solution:
-        covered |= subsets[idx]
-    return len(covered) == n
+        covered |= masks[idx]
+        if covered == full:
+            return True
+    return False
+
+
+def count_covers(n, subsets, solution):
+    '''cover_count[e] = number of chosen subsets covering element e'''
+    cover_count = [0] * (n + 1)
+    for idx in solution:
+        for e in subsets[idx]:
+            cover_count[e] += 1
+    return cover_count
+
+
+def add_subset(subsets, cover_count, idx):
+    '''adds subset idx to cover_count'''
+    for e in subsets[idx]:
+        cover_count[e] += 1
+
+
+def remove_subset(subsets, cover_count, idx):
+    '''removes subset idx from cover_count'''
+    for e in subsets[idx]:
+        cover_count[e] -= 1
+
+
+def is_redundant(subsets, cover_count, idx):
+    '''checks if every element of chosen subset idx is also covered by another chosen subset'''
+    return all(cover_count[e] > 1 for e in subsets[idx])
+
+
+def make_repair(n, masks, maxsize=1 << 16):
+    '''greedy completion of a partial solution given as a bitmask of subset ids,
+    memoized since the local search keeps revisiting the same states'''
+    @functools.lru_cache(maxsize=maxsize)
+    def repair(sol_mask):
+        return frozenset(greedy_candidate_sol(n, masks, set(iter_bits(sol_mask))))
+    return repair
 
 
-def get_neighbor(n, subsets, current_sol):
+def get_neighbor(subsets, current_sol, cover_count, repair):
     '''create neighbor by randomly flipping membership of a subset, then find new candidate sol if needed'''
     idx = random.randint(0, len(subsets)-1)
     neighbor = set(current_sol)
     if idx in neighbor:
         neighbor.remove(idx)
+        # current_sol is a cover, so only dropping a non-redundant subset can break it
+        if not is_redundant(subsets, cover_count, idx):
+            neighbor = set(repair(sum(1 << i for i in neighbor)))
     else:
         neighbor.add(idx)
-    if not covers_all(n, subsets, neighbor):
-        neighbor = greedy_candidate_sol(n, subsets, neighbor)
     return neighbor
 
 
-def simulated_annealing(n, subsets, time_limit, T_0, alpha, max_no_improvement=10000):
+def simulated_annealing(n, subsets, masks, time_limit, T_0, alpha, max_no_improvement=10000):
     '''simulated annealing algorithm: first variant of a local search algorithm as presented in lecture'''
-    start = time.time()
-    current_sol = greedy_candidate_sol(n, subsets)  # generate initial solution
+    start = time.perf_counter()
+    current_sol = greedy_candidate_sol(n, masks)  # generate initial solution
+    current_cost = cost(current_sol)
+    cover_count = count_covers(n, subsets, current_sol)  # kept in sync with current_sol
+    repair = make_repair(n, masks)
     best = set(current_sol)
+    best_cost = current_cost
     T = T_0
-    trace = [(0.0, cost(best))]
+    trace = [(0.0, best_cost)]
     no_improvement = 0
-    while time.time() - start < time_limit:
-        elapsed = time.time() - start
+    # Costs are integers, so a worse move has delta in {-1, -2, ...}: accept_tbl[d] = exp(-d/T) is the
+    # probability of accepting a move that adds d subsets. It is rebuilt once T has dropped by more than 1%,
+    # and frozen once exp underflows to 0.0 (worse moves are never accepted from then on).
+    MAX_DELTA = 8  # larger increases use accept_tbl[1] ** d
+    accept_tbl, refresh_below = None, float('inf')
+    # bind hot callables to locals to skip global/attribute lookups in the tight loop
+    clock, rand, exp = time.perf_counter, random.random, math.exp
+    while True:
+        elapsed = clock() - start
+        if elapsed >= time_limit:
+            break
         T *= alpha  # decrease temp by cooling factor
-        neighbor = get_neighbor(n, subsets, current_sol)
-        delta = cost(current_sol) - cost(neighbor)
-        if delta > 0 or random.random() < math.exp(delta/T):
-            current_sol = neighbor
-            if cost(current_sol) < cost(best):
-                best = set(current_sol)
-                trace.append((elapsed, cost(best)))
+        if T < refresh_below:
+            accept_tbl = [exp(-d / T) for d in range(MAX_DELTA + 1)]
+            refresh_below = 0.99 * T if accept_tbl[1] > 0.0 else 0.0
+        neighbor = get_neighbor(subsets, current_sol, cover_count, repair)
+        neighbor_cost = cost(neighbor)
+        delta = current_cost - neighbor_cost
+        if delta > 0 or rand() < (accept_tbl[-delta] if -delta <= MAX_DELTA else accept_tbl[1] ** -delta):
+            for idx in current_sol - neighbor:
+                remove_subset(subsets, cover_count, idx)
+            for idx in neighbor - current_sol:
+                add_subset(subsets, cover_count, idx)
+            current_sol, current_cost = neighbor, neighbor_cost
+            if current_cost < best_cost:
+                best, best_cost = set(current_sol), current_cost
+                trace.append((elapsed, best_cost))
                 no_improvement = 0
             else:
                 no_improvement += 1
@@ -163,63 +395,66 @@ def simulated_annealing(n, subsets, time_limit, T_0, alpha, max_no_improvement=1
     return best, trace
 
 
-def random_init(n, subsets):
-    uncovered = set(range(1, n+1))
+def random_init(n, masks):
+    uncovered = (1 << (n + 1)) - 2
     sol = set()
     while uncovered:
         candidates = [i for i in range(
-            len(subsets)) if len(uncovered.intersection(subsets[i])) > 0]
+            len(masks)) if uncovered & masks[i]]
         idx = random.choice(candidates)
         sol.add(idx)
-        uncovered -= subsets[idx]
+        uncovered &= ~masks[idx]
     return sol
 
 
-def get_best_neighbor(n, subsets, current_sol):
-    best_cost = cost(current_sol)
-    best_sol = None
-    for i in range(len(subsets)):
-        neigh = set(current_sol)
-        if i in neigh:
-            neigh.remove(i)
-        else:
-            neigh.add(i)
-        if not covers_all(n, subsets, neigh):
-            neigh = greedy_candidate_sol(n, subsets, neigh)
-        if cost(neigh) < best_cost:
-            best_cost = cost(neigh)
-            best_sol = neigh
-    return best_sol
-
-
-def random_restart_hill_climbing(n, subsets, time_limit, max_no_improvement=10000): 
+def covered_once(masks, solution):
+    '''bitmask of the elements covered by exactly one subset of solution'''
+    once, multi = 0, 0
+    for idx in solution:
+        multi |= once & masks[idx]
+        once |= masks[idx]
+    return once & ~multi
+
+
+def get_best_neighbor(n, masks, current_sol):
+    '''best single flip of a cover: adding a subset or repairing a removal never lowers the cost,
+    so the only improving flips are removals of redundant subsets, all of which cost the same'''
+    # a chosen subset is redundant iff it holds none of the elements covered exactly once
+    once = covered_once(masks, current_sol)
+    for i in sorted(current_sol):
+        if not masks[i] & once:
+            return current_sol - {i}
+    return None
+
+
+def random_restart_hill_climbing(n, masks, time_limit, max_no_improvement=10000): 
     '''simulated annealing algorithm: second variant of a local search algorithm as presented in lecture'''
-    start = time.time()
+    start = time.perf_counter()
     best = None
     trace = []
     no_improvement = 0
 
-    current = random_init(n, subsets)
-    while not covers_all(n, subsets, current):
-        current = random_init(n, subsets)
+    current = random_init(n, masks)
+    while not covers_all(n, masks, current):
+        current = random_init(n, masks)
     
     best = set(current)
     trace.append((0.0, cost(best)))
     while True:
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
         if elapsed > time_limit:
             break
-        current = random_init(n, subsets) # made it fully random instead of greedy
+        current = random_init(n, masks) # made it fully random instead of greedy
         while True:
-            if time.time() - start > time_limit:
+            if time.perf_counter() - start > time_limit:
                 return best, trace
-            neighbor = get_best_neighbor(n, subsets, current)
+            neighbor = get_best_neighbor(n, masks, current)
             if neighbor is None:
                 break
             current = neighbor
             if cost(current) < cost(best):
                 best = set(current)
-                trace.append((time.time() - start, cost(best)))
+                trace.append((time.perf_counter() - start, cost(best)))
                 no_improvement = 0
             else:
                 no_improvement += 1
@@ -237,9 +472,11 @@ def write_sol(instance, method, cutoff, seed, sol):
         fname += f"_{seed}"
     fname += ".sol"
     out_path = os.path.join(OUTPUT_DIR, fname)
-    with open(out_path, "w") as f:
-        f.write(str(len(sol)) + '\n')
-        f.write(' '.join(str(i+1) for i in sorted(sol)) + '\n')
+    # written whole to a temporary file and renamed, so a reader never sees a half written solution
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(f"{len(sol)}\n{' '.join(str(i+1) for i in sorted(sol))}\n".encode())
+    os.replace(tmp_path, out_path)
 
 
 def write_trace(instance, method, cutoff, seed, trace):
@@ -255,6 +492,39 @@ def write_trace(instance, method, cutoff, seed, trace):
             f.write(f"{t:.4f} {q}\n")
 
 
+def load_instance(file):
+    '''reads an instance and drops dominated subsets, returns n, subsets, masks and the original ids of the kept subsets'''
+    n, subsets, masks = read_instance(file)
+    subsets, masks, ids = drop_dominated(n, subsets, masks)
+    return n, subsets, masks, ids
+
+
+def run_ls1(instance, time_limit, seed, data=None):
+    '''runs LS1 on an instance file with the command line settings and writes its .sol and .trace files,
+    data can be the already loaded instance from load_instance, returns the solution size'''
+    n, subsets, masks, ids = data if data is not None else load_instance(instance)
+    random.seed(seed)
+    best, trace = simulated_annealing(
+        n, subsets, masks, time_limit, T_0=1.0, alpha=0.98)
+    best = {ids[i] for i in best}  # back to the subset numbering of the instance file
+    write_sol(instance, 'LS1', int(time_limit), seed, best)
+    write_trace(instance, 'LS1', int(time_limit), seed, trace)
+    return len(best)
+
+
+def run_ls2(instance, time_limit, seed, data=None):
+    '''runs LS2 on an instance file with the command line settings and writes its .sol and .trace files,
+    data can be the already loaded instance from load_instance, returns the solution size'''
+    n, subsets, masks, ids = data if data is not None else load_instance(instance)
+    random.seed(seed)
+    best, trace = random_restart_hill_climbing(
+        n, masks, time_limit, max_no_improvement=500)
+    best = {ids[i] for i in best}  # back to the subset numbering of the instance file
+    write_sol(instance, 'LS2', int(time_limit), seed, best)
+    write_trace(instance, 'LS2', int(time_limit), seed, trace)
+    return len(best)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('-inst', required=True)
@@ -262,28 +532,30 @@ def main():
         '-alg', choices=['LS1', 'LS2', 'BnB', 'Approx'], required=True)
     parser.add_argument('-time', type=float, required=True)
     parser.add_argument('-seed', type=int)
+    parser.add_argument('-seeds', help='comma separated seeds, overrides -seed for LS1/LS2 and runs once per seed')
+    parser.add_argument('-workers', type=int, default=1)
     args = parser.parse_args()
 
-    random.seed(args.seed)
-    n, subsets = read_instance(args.inst)
-    if args.alg == 'LS1':
-        best, trace = simulated_annealing(
-            n, subsets, args.time, T_0=1.0, alpha=0.98)
-        write_sol(args.inst, 'LS1', int(args.time), args.seed, best)
-        write_trace(args.inst, 'LS1', int(args.time), args.seed, trace)
-    elif args.alg == 'LS2':
-        best, trace = random_restart_hill_climbing(
-            n, subsets, args.time, max_no_improvement=500)
-        write_sol(args.inst, 'LS2', int(args.time), args.seed, best)
-        write_trace(args.inst, 'LS2', int(args.time), args.seed, trace)
-    elif args.alg == 'BnB':
-        best, trace = find_bnb_sol(n, subsets, args.time)
-        write_sol(args.inst, 'BnB', int(args.time), None, best)
-        write_trace(args.inst, 'BnB', int(args.time), None, trace) 
+    data = load_instance(args.inst)
+    if args.alg in ('LS1', 'LS2'):
+        # the instance is loaded once and reused by every seed's run
+        seeds = [int(seed) for seed in args.seeds.split(',')] if args.seeds else [args.seed]
+        run = run_ls1 if args.alg == 'LS1' else run_ls2
+        for seed in seeds:
+            run(args.inst, args.time, seed, data)
+        return
+
+    n, subsets, masks, ids = data
+    trace = None
+    if args.alg == 'BnB':
+        best, trace = find_bnb_sol(n, subsets, masks, args.time, workers=args.workers)
     elif args.alg == 'Approx':
-        best = greedy_candidate_sol(n, subsets)
-        write_sol(args.inst, 'Approx', int(args.time), None, best)   
+        best = greedy_candidate_sol(n, masks)
 
+    best = {ids[i] for i in best}  # back to the subset numbering of the instance file
+    write_sol(args.inst, args.alg, int(args.time), None, best)
+    if trace is not None:
+        write_trace(args.inst, args.alg, int(args.time), None, trace)
 
 if __name__ == '__main__':
     main()
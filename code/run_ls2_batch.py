@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+'''
+Batch experiment for LS2 (random restart hill climbing).
+Runs every small and large instance with each seed and writes the average runtime,
+average solution size and relative error per instance to results/ls2_results.csv.
+Rows are written as instances finish, so they follow completion order.
+
+The algorithm is called in-process by the pool workers, so a run does not pay for
+starting a new interpreter and re-importing algos.py. Instances are parsed once in the
+parent and handed to the workers when the pool starts, so no run re-parses its input.
+Run from the code/ directory.
+'''
+import csv
+import functools
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from algos import load_instance, run_ls2
+
+DATA_DIR = "data"
+RESULTS_FILE = os.path.join("results", "ls2_results.csv")
+TIME_LIMIT = 600
+SEEDS = range(1, 11)
+# recycle workers after a few instances so memory held by long LS2 runs does not pile up
+MAX_TASKS_PER_CHILD = 4
+
+# parsed instances, filled in each worker by init_worker
+INSTANCES = {}
+# CPUs workers get pinned to and a shared flag per CPU telling whether a worker holds it,
+# filled by init_worker where os.sched_setaffinity exists (Linux)
+PINNING = {}
+
+
+def init_worker(instances, cpus, cpu_taken):
+    # with fork the workers inherit the parent's parsed data, with spawn it is sent once per worker
+    INSTANCES.update(instances)
+    # drop the per-run progress prints of algos.py so workers do not contend for the terminal
+    sys.stdout = open(os.devnull, "w")
+    if cpu_taken is not None:
+        PINNING.update(cpus=cpus, cpu_taken=cpu_taken)
+
+
+def claim_cpu():
+    '''pins this worker to a CPU no other worker is running on, returns its index or None if not pinned'''
+    if not PINNING:
+        return None
+    cpu_taken = PINNING['cpu_taken']
+    with cpu_taken.get_lock():
+        free = [i for i, taken in enumerate(cpu_taken) if not taken]
+        if not free:
+            return None
+        slot = free[0]
+        cpu_taken[slot] = 1
+    os.sched_setaffinity(0, {PINNING['cpus'][slot]})
+    return slot
+
+
+def release_cpu(slot):
+    if slot is not None:
+        with PINNING['cpu_taken'].get_lock():
+            PINNING['cpu_taken'][slot] = 0
+
+
+@functools.lru_cache(maxsize=None)
+def read_optimal(inst_path):
+    '''optimal solution size from the instance's .out file, None if it does not ship one'''
+    opt_file = inst_path[:-3] + ".out"
+    if not os.path.exists(opt_file):
+        return None
+    with open(opt_file) as f:
+        return int(f.readline())
+
+
+def run_one(args):
+    '''runs LS2 on one instance for every seed, returns (instance, elapsed seconds per seed, solution size per seed)'''
+    inst_path, seeds = args
+    data = INSTANCES.get(inst_path)
+    if data is None:  # not preloaded, parse once and keep it for this worker's later tasks
+        data = INSTANCES[inst_path] = load_instance(inst_path)
+    times, sizes = [], []
+    # pinned per task rather than per worker: recycled workers would otherwise pile onto the same CPUs
+    slot = claim_cpu()
+    try:
+        for seed in seeds:
+            start = time.perf_counter()
+            sizes.append(run_ls2(inst_path, TIME_LIMIT, seed, data))
+            times.append(time.perf_counter() - start)
+    finally:
+        release_cpu(slot)
+    return inst_path, times, sizes
+
+
+def main():
+    # one directory scan finds the instances and their file sizes, the size is the runtime proxy
+    # for dispatching the largest instances first so the longest bundles do not start last
+    entries = [e for e in os.scandir(DATA_DIR)
+               if e.name.endswith(".in") and e.name.startswith(("small", "large"))]
+    entries.sort(key=lambda e: e.stat().st_size, reverse=True)
+    instances = [e.path for e in entries]
+    parsed = {inst: load_instance(inst) for inst in instances}
+    optimals = {inst: read_optimal(inst) for inst in instances}
+    # one task per instance runs all of its seeds
+    tasks = [(inst, SEEDS) for inst in instances]
+    # fork (where available) lets workers, including recycled ones, start from the parent's
+    # already imported modules and parsed instances instead of re-importing everything
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    # keep each worker on its own CPU so the scheduler does not migrate them across cores
+    if hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu_taken = ctx.Array('b', len(cpus))
+    else:
+        cpus, cpu_taken = [], None
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "w", newline="") as csvfile, \
+            ctx.Pool(processes=len(cpus) or mp.cpu_count(), maxtasksperchild=MAX_TASKS_PER_CHILD,
+                     initializer=init_worker, initargs=(parsed, cpus, cpu_taken)) as pool:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Instance", "AvgTime(s)", "AvgSize", "RelErr"])
+        # hand out one task at a time so a worker stuck on a large instance does not hold queued small ones
+        for inst, times, sizes in pool.imap_unordered(run_one, tasks, chunksize=1):
+            avg_time = sum(times) / len(times)
+            avg_size = sum(sizes) / len(sizes)
+            optimal = optimals[inst]
+            rel_err = "" if optimal is None else f"{(avg_size - optimal) / optimal:.3f}"
+            inst_name = os.path.splitext(os.path.basename(inst))[0]
+            writer.writerow([inst_name, f"{avg_time:.3f}", f"{avg_size:.3f}", rel_err])
+            csvfile.flush()  # finished instances survive an interrupted batch
+
+
+if __name__ == '__main__':
+    main()